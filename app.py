@@ -1,78 +1,574 @@
 # app.py (updated with improved error handling and Bahasa Indonesia output)
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 import os
-import json
+import re
 import logging
-import traceback
-from datetime import datetime
+import atexit
+import itertools
+import queue
+from logging.handlers import QueueHandler, QueueListener
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import time
 from dotenv import load_dotenv
 
 # Try to import aisuite, but make it optional for testing
 try:
     import aisuite as ai
+    import httpx  # Installed with the aisuite provider SDKs
     AISUITE_AVAILABLE = True
 except ImportError:
     AISUITE_AVAILABLE = False
     print("WARNING: aisuite not available - AI features will be disabled")
 
+# Raised by aisuite providers, e.g. for unsupported streaming (kept importable
+# without aisuite so stream_completion can always reference it)
+try:
+    from aisuite.provider import LLMError
+except ImportError:
+    LLMError = NotImplementedError
+
+# Use orjson for request/response JSON when available, falling back to stdlib json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Use msgspec to decode and validate misuse cases in one pass when available
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
 # Load environment variables first
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('api_calls.log'),
-        logging.StreamHandler()  # Also print to console
-    ]
-)
+# Matches a JSON array of objects embedded in free-form LLM output
+_JSON_ARRAY_RE = re.compile(r'\[\s*\{.*\}\s*\]', re.DOTALL)
+
+# Request threads per gunicorn worker, shared with gunicorn.conf.py
+WORKER_THREADS = int(os.getenv('WORKER_THREADS', '8'))
+
+# Limits on misuse case generation input, bounding prompt size and per-request work
+MAX_REQUEST_BYTES = 16 * 1024
+# The frontend's "all use cases" mode sends every use case name joined with ", "
+MAX_USE_CASE_NAME_LENGTH = 4000
+MAX_SYSTEM_NAME_LENGTH = 200
+MAX_OTHER_USE_CASES = 20
+MAX_OTHER_USE_CASE_LENGTH = 120
+
+
+# Prompts for misuse case generation - instructs the LLM to answer in Bahasa Indonesia
+SYSTEM_PROMPT = """Anda adalah seorang ahli keamanan yang mengkhususkan diri dalam mengidentifikasi potensi kasus penyalahgunaan (misuse case) untuk sistem perangkat lunak.
+        Diberikan sebuah use case, identifikasi 3-5 skenario penyalahgunaan potensial yang dapat mengancamnya.
+        Format respons Anda sebagai array JSON dengan struktur berikut:
+        [
+            {
+                "name": "Nama singkat kasus penyalahgunaan",
+                "description": "Deskripsi detail yang menjelaskan skenario penyalahgunaan",
+                "actor": "Jenis aktor berbahaya yang mungkin melakukan ini",
+                "impact": "Dampak potensial dari kasus penyalahgunaan ini"
+            },
+            ...
+        ]
+        PENTING: Respons Anda HARUS sepenuhnya dalam Bahasa Indonesia, termasuk semua nilai dalam JSON.
+        Hanya berikan array JSON saja tanpa tambahan kalimat lain."""
+
+USER_PROMPT_TEMPLATE = """Use Case: {use_case_name}
+        Sistem: {system_name}
+        Use Case Terkait: {other_use_cases}
+        Harap generate 3-5 kasus penyalahgunaan (misuse case) realistis yang dapat mengancam use case ini.
+        Fokus pada kerentanan keamanan, pola penggunaan berbahaya, dan potensi eksploitasi sistem.
+        Respons Anda HARUS dalam Bahasa Indonesia."""
+
+_BASE_MESSAGES = ({"role": "system", "content": SYSTEM_PROMPT},)
+
+# Configure logging - request threads only enqueue records, a background
+# listener thread formats them and does the file and console writes
+class _DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves all formatting, including tracebacks, to the listener"""
+
+    def prepare(self, record):
+        # The queue is in-process, so the record doesn't need to be made picklable
+        return record
+
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = [
+    logging.FileHandler('api_calls.log'),
+    logging.StreamHandler()  # Also print to console
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+
+_log_queue = queue.Queue(-1)
+_log_listener = QueueListener(_log_queue, *_log_handlers)
+# Not basicConfig, which would attach an (unused) formatter to the queue handler
+logging.getLogger().setLevel(logging.INFO)
+logging.getLogger().addHandler(_DeferredQueueHandler(_log_queue))
+_log_listener.start()
+atexit.register(_log_listener.stop)  # Flush pending records on shutdown
 
 class APILogger:
+    __slots__ = ('logger',)
+
     def __init__(self):
         self.logger = logging.getLogger('api.llm')
 
     def log_request(self, model, messages, temperature, **kwargs):
-        """Log details of the API request"""
-        self.logger.info(f"API REQUEST: {model}")
-        self.logger.info(f"Temperature: {temperature}")
-        self.logger.info(f"Message count: {len(messages)}")
+        """Log details of the API request as a single record"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return time.monotonic_ns()
+
         # Log first few chars of the last message to avoid logging sensitive data
-        if messages and len(messages) > 0:
+        preview = ''
+        if messages:
             last_msg = messages[-1].get('content', '')
             preview = last_msg[:100] + ('...' if len(last_msg) > 100 else '')
-            self.logger.info(f"Last message preview: {preview}")
 
-        # Log additional parameters if present
-        for key, value in kwargs.items():
-            self.logger.info(f"Param {key}: {value}")
+        # Include additional parameters if present
+        params = ' '.join(f"{key}={value}" for key, value in kwargs.items())
+        self.logger.info(
+            "API REQUEST: model=%s temperature=%s message_count=%d preview=%r %s",
+            model, temperature, len(messages), preview, params
+        )
+
+        return time.monotonic_ns()  # Return monotonic timestamp for duration calculation
+
+    def log_response(self, start_time, status, content_length=None, error=None, cache_hit=False):
+        """Log details of the API response as a single record"""
+        level = logging.ERROR if error else logging.INFO
+        if not self.logger.isEnabledFor(level):
+            return
+
+        duration_s = (time.monotonic_ns() - start_time) / 1e9
+        self.logger.log(
+            level,
+            "API RESPONSE: status=%s duration=%.2fs content_length=%s cache_hit=%s%s",
+            status, duration_s, content_length, cache_hit,
+            f" error={error}" if error else ''
+        )
+
+class MisuseCaseCache:
+    """Two-tier cache for generated misuse cases.
+
+    The exact tier is an LRU dict keyed by the normalized input triple. The
+    optional semantic tier compares sentence embeddings of the input and
+    returns a cached result when the cosine similarity passes the threshold.
+    """
+
+    def __init__(self, max_entries=1024, semantic_threshold=0.92, embedding_model=None):
+        self.max_entries = max_entries
+        self.semantic_threshold = semantic_threshold
+        self.embedding_model = embedding_model
+        self._exact = OrderedDict()
+        self._semantic = deque(maxlen=max_entries)  # (embedding, misuse_cases)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(use_case_name, system_name, other_use_cases):
+        """Build a normalized, hashable key from the request input"""
+        return (
+            use_case_name.lower().strip(),
+            system_name.lower().strip(),
+            tuple(sorted(str(uc).lower().strip() for uc in other_use_cases))
+        )
+
+    def _embed(self, key):
+        use_case_name, system_name, other_use_cases = key
+        text = f"{use_case_name} | {system_name} | {', '.join(other_use_cases)}"
+        return self.embedding_model.encode(text, normalize_embeddings=True)
+
+    def lookup(self, key):
+        """Return cached misuse cases for the key, or None on a miss"""
+        with self._lock:
+            if key in self._exact:
+                self._exact.move_to_end(key)
+                return self._exact[key]
+
+        if self.embedding_model is None:
+            return None
+
+        embedding = self._embed(key)
+        with self._lock:
+            best_score, best_data = 0.0, None
+            for cached_embedding, data in self._semantic:
+                # Embeddings are normalized, so the dot product is the cosine similarity
+                score = float(embedding @ cached_embedding)
+                if score > best_score:
+                    best_score, best_data = score, data
+        if best_score >= self.semantic_threshold:
+            return best_data
+        return None
+
+    def store(self, key, misuse_cases):
+        """Store misuse cases for the key in both cache tiers"""
+        embedding = self._embed(key) if self.embedding_model is not None else None
+        with self._lock:
+            self._exact[key] = misuse_cases
+            self._exact.move_to_end(key)
+            if len(self._exact) > self.max_entries:
+                self._exact.popitem(last=False)
+            if embedding is not None:
+                self._semantic.append((embedding, misuse_cases))
+
+
+MISUSE_CASE_FIELDS = ("name", "description", "actor", "impact")
+
+if MSGSPEC_AVAILABLE:
+    class MisuseCase(msgspec.Struct):
+        """A generated misuse case; missing fields get a placeholder value"""
+        name: str = "Informasi name tidak tersedia"
+        description: str = "Informasi description tidak tersedia"
+        actor: str = "Informasi actor tidak tersedia"
+        impact: str = "Informasi impact tidak tersedia"
+
+    _misuse_case_decoder = msgspec.json.Decoder(list[MisuseCase])
+
+
+def parse_misuse_cases(text):
+    """Parse an LLM response into a list of misuse case dicts.
+
+    Missing or null fields are filled with a placeholder and other non-string
+    values are converted to strings. Raises ValueError if the text is not a
+    valid JSON array of objects.
+    """
+    if MSGSPEC_AVAILABLE:
+        try:
+            return msgspec.to_builtins(_misuse_case_decoder.decode(text))
+        except msgspec.ValidationError:
+            pass  # Valid JSON but a field is null or not a string; repair it below
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+    misuse_cases = app.json.loads(text)
+    if not isinstance(misuse_cases, list) or not all(isinstance(mc, dict) for mc in misuse_cases):
+        raise ValueError("Respons LLM bukan array objek misuse case")
+
+    # Rebuild each dict with the interned MISUSE_CASE_FIELDS keys (dropping unknown
+    # fields like the msgspec path does) so all misuse cases share the key strings
+    return [
+        {field: _misuse_case_field(misuse_case, field) for field in MISUSE_CASE_FIELDS}
+        for misuse_case in misuse_cases
+    ]
+
+def _misuse_case_field(misuse_case, field):
+    """Return a misuse case field as a string, with a placeholder if missing or null"""
+    value = misuse_case.get(field)
+    if value is None:
+        return f"Informasi {field} tidak tersedia"
+    return value if isinstance(value, str) else str(value)
+
+
+def has_misuse_case_content(misuse_case):
+    """Whether a parsed misuse case has any field besides the placeholders"""
+    return any(
+        misuse_case[field] != f"Informasi {field} tidak tersedia"
+        for field in MISUSE_CASE_FIELDS
+    )
+
+def _should_cache(misuse_cases):
+    """Only cache results with at least one real misuse case.
+
+    Empty or placeholder-only results would otherwise be served for the key
+    without ever calling the LLM again.
+    """
+    return any(has_misuse_case_content(misuse_case) for misuse_case in misuse_cases)
+
+
+class MisuseCaseStreamParser:
+    """Incrementally extract complete top-level JSON objects from streamed LLM output"""
+
+    def __init__(self):
+        self._buffer = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, text):
+        """Consume a chunk of text and return the raw JSON objects it completes"""
+        completed = []
+        for char in text:
+            if self._depth == 0:
+                # Skip the array brackets, separators and any surrounding prose
+                if char == '{':
+                    self._depth = 1
+                    self._buffer = [char]
+                continue
+
+            self._buffer.append(char)
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == '{':
+                self._depth += 1
+            elif char == '}':
+                self._depth -= 1
+                if self._depth == 0:
+                    completed.append(''.join(self._buffer))
+        return completed
 
-        return datetime.now()  # Return timestamp for duration calculation
 
-    def log_response(self, start_time, status, content_length=None, error=None):
-        """Log details of the API response"""
-        duration = datetime.now() - start_time
-        self.logger.info(f"API RESPONSE: {status}")
-        self.logger.info(f"Duration: {duration.total_seconds():.2f}s")
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson (used by jsonify and request.json)"""
 
-        if content_length:
-            self.logger.info(f"Content length: {content_length} chars")
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode('utf-8')
 
-        if error:
-            self.logger.error(f"Error: {error}")
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+def _load_embedding_model():
+    """Load the sentence-embedding model for the semantic cache tier, if enabled"""
+    if os.getenv('SEMANTIC_CACHE', '0') != '1':
+        return None
+    try:
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(os.getenv('SEMANTIC_CACHE_MODEL', 'all-MiniLM-L6-v2'))
+    except Exception as e:
+        logging.warning(f"Semantic cache disabled: {str(e)}")
+        return None
 
 app = Flask(__name__)
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
+
+def _build_http_client():
+    """Create the pooled keep-alive HTTP client shared by all LLM requests"""
+    try:
+        import h2  # noqa: F401 - required by httpx for HTTP/2
+        http2 = True
+    except ImportError:
+        http2 = False
+    return httpx.Client(
+        http2=http2,
+        timeout=LLM_TIMEOUT,
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+    )
+
+def _timeout_kwargs(model, timeout=None):
+    """Return the per-request timeout kwargs for the model's aisuite provider.
+
+    Only the Groq SDK accepts a per-request timeout (defaults to LLM_TIMEOUT).
+    Other providers, e.g. Together, would post it in the JSON body, so their
+    timeout is set once through provider_configs instead.
+    """
+    if model.partition(':')[0] == 'groq':
+        return {"timeout": LLM_TIMEOUT if timeout is None else timeout}
+    return {}
 
 # Initialize AIsuIte client if available
 if AISUITE_AVAILABLE:
-    client = ai.Client()
+    # Separate connect/read budgets so a slow handshake doesn't eat the 30s read timeout
+    LLM_TIMEOUT = httpx.Timeout(connect=3.0, read=30.0, write=5.0, pool=5.0)
+    http_client = _build_http_client()
+    # Only configure providers whose API key is set: some aisuite versions build
+    # configured providers eagerly, and the providers raise without a key.
+    # Unconfigured providers are created lazily on first use.
+    provider_configs = {}
+    if os.getenv('GROQ_API_KEY'):
+        provider_configs["groq"] = {"http_client": http_client}
+    if os.getenv('TOGETHER_API_KEY'):
+        provider_configs["together"] = {"timeout": LLM_TIMEOUT.read}
+    client = ai.Client(provider_configs=provider_configs)
     api_logger = APILogger()
     # MODEL = "together:meta-llama/Llama-4-Maverick-17B-128E-Instruct-FP8"  # You can change to your preferred model
     MODEL = "groq:meta-llama/llama-4-maverick-17b-128e-instruct"
+    # LLM_MODELS (comma-separated) queries several models concurrently and uses the
+    # first valid response; the first entry is also the model used for streaming
+    MODELS = [m.strip() for m in os.getenv('LLM_MODELS', '').split(',') if m.strip()] or [MODEL]
+    MODEL = MODELS[0]
+    # One thread per model for each request a gunicorn worker handles concurrently
+    _executor = ThreadPoolExecutor(max_workers=len(MODELS) * WORKER_THREADS)
 else:
+    LLM_TIMEOUT = None
+    http_client = None
     client = None
     api_logger = APILogger()
     MODEL = None
+    MODELS = []
+    _executor = None
+
+def _warm_up_models():
+    """Send a minimal request to each model so the first user request hits warm connections"""
+    for model in MODELS:
+        try:
+            client.chat.completions.create(
+                model=model,
+                messages=[{"role": "user", "content": "ping"}],
+                max_tokens=1,
+                **_timeout_kwargs(model, timeout=5)
+            )
+        except Exception as e:
+            logging.warning(f"Warmup request to {model} failed: {str(e)}")
+
+# Best-effort warmup in the background, opt-in so tests and local runs stay fast
+if AISUITE_AVAILABLE and os.getenv('WARMUP', '0') == '1':
+    threading.Thread(target=_warm_up_models, daemon=True).start()
+
+misuse_case_cache = MisuseCaseCache(
+    max_entries=int(os.getenv('CACHE_MAX_ENTRIES', '1024')),
+    semantic_threshold=float(os.getenv('SEMANTIC_CACHE_THRESHOLD', '0.92')),
+    embedding_model=_load_embedding_model()
+)
+
+class InvalidInputError(Exception):
+    """Raised when a misuse case generation request body can't be used"""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+def _read_misuse_case_input():
+    """Extract (use_case_name, system_name, other_use_cases) from the request body.
+
+    Raises InvalidInputError if the body is too large, is not a JSON object
+    or has no use case name.
+    """
+    if (request.content_length or 0) > MAX_REQUEST_BYTES:
+        raise InvalidInputError("Permintaan terlalu besar", 413)
+    # Read at most one byte past the limit, which also bounds chunked bodies
+    # that don't declare a Content-Length
+    body = request.stream.read(MAX_REQUEST_BYTES + 1)
+    if len(body) > MAX_REQUEST_BYTES:
+        raise InvalidInputError("Permintaan terlalu besar", 413)
+
+    try:
+        data = app.json.loads(body)
+    except ValueError:
+        raise InvalidInputError("Body permintaan harus berupa JSON yang valid")
+    if not isinstance(data, dict):
+        raise InvalidInputError("Body permintaan harus berupa objek JSON")
+
+    use_case_name = data.get('useCaseName')
+    if not isinstance(use_case_name, str) or not use_case_name.strip():
+        raise InvalidInputError("Nama use case diperlukan")
+    system_name = data.get('systemName')
+    if not isinstance(system_name, str):
+        system_name = 'the system'
+    other_use_cases = data.get('otherUseCases')
+    if not isinstance(other_use_cases, list):
+        other_use_cases = []
+
+    # Clamp all fields so a large client payload can't inflate the prompt
+    return (
+        use_case_name[:MAX_USE_CASE_NAME_LENGTH],
+        system_name[:MAX_SYSTEM_NAME_LENGTH],
+        [
+            str(other)[:MAX_OTHER_USE_CASE_LENGTH]
+            for other in other_use_cases[:MAX_OTHER_USE_CASES]
+            if other is not None
+        ]
+    )
+
+def build_messages(use_case_name, system_name, other_use_cases):
+    """Build the LLM chat messages from the module-level prompt templates"""
+    user_prompt = USER_PROMPT_TEMPLATE.format(
+        use_case_name=use_case_name,
+        system_name=system_name,
+        other_use_cases=', '.join(other_use_cases) if other_use_cases else 'Tidak ada'
+    )
+    return [*_BASE_MESSAGES, {"role": "user", "content": user_prompt}]
+
+def _complete(model, messages, temperature):
+    """Run a single (non-streaming) chat completion and return its content"""
+    response = client.chat.completions.create(
+        model=model,
+        messages=messages,
+        temperature=temperature,
+        **_timeout_kwargs(model)
+    )
+    return response.choices[0].message.content
+
+def stream_completion(model, messages, temperature):
+    """Yield the content of a chat completion in chunks as they arrive.
+
+    Streams through aisuite with stream=True. Providers without streaming
+    support (aisuite raises LLMError, e.g. GroqProvider in aisuite 0.2.0) fall
+    back to a single non-streaming call whose content is yielded at once.
+    """
+    try:
+        chunks = iter(client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            stream=True,
+            **_timeout_kwargs(model)
+        ))
+        first_chunk = next(chunks, None)
+    except LLMError as e:
+        logging.warning(f"Streaming not available for {model}, using a single call: {str(e)}")
+        yield _complete(model, messages, temperature) or ''
+        return
+
+    if first_chunk is None:
+        return
+    for chunk in itertools.chain((first_chunk,), chunks):
+        if not chunk.choices:
+            continue
+        content = chunk.choices[0].delta.content
+        if content:
+            yield content
+
+def extract_misuse_cases(result):
+    """Parse misuse cases from raw LLM output.
+
+    Falls back to the first JSON array embedded in the text, which handles
+    responses where the LLM adds explanatory text. Raises ValueError if no
+    valid misuse case array can be found.
+    """
+    try:
+        return parse_misuse_cases(result or '')
+    except ValueError:
+        json_match = _JSON_ARRAY_RE.search(result or '')
+        if not json_match:
+            raise
+        return parse_misuse_cases(json_match.group(0))
+
+def generate_with_models(messages, temperature):
+    """Query all configured models concurrently and return the first valid result.
+
+    Returns a (raw_result, misuse_cases) tuple. If no model produces valid
+    misuse cases, the last error is raised (ValueError for unparseable output).
+    """
+    if len(MODELS) == 1:
+        result = _complete(MODELS[0], messages, temperature)
+        return result, extract_misuse_cases(result)
+
+    futures = {
+        _executor.submit(_complete, model, messages, temperature): model
+        for model in MODELS
+    }
+    last_error = None
+    try:
+        for future in as_completed(futures, timeout=LLM_TIMEOUT.read):
+            try:
+                result = future.result()
+                return result, extract_misuse_cases(result)
+            except Exception as e:
+                logging.warning(f"Model {futures[future]} failed: {str(e)}")
+                last_error = e
+    finally:
+        # Results of slower models are no longer needed
+        for future in futures:
+            future.cancel()
+    raise last_error
+
+def _sse_event(event, payload):
+    """Format a Server-Sent Event frame with a JSON payload"""
+    return f"event: {event}\ndata: {app.json.dumps(payload)}\n\n"
 
 @app.route('/')
 def index():
@@ -81,13 +577,12 @@ def index():
 @app.route('/save', methods=['POST'])
 def save_diagram():
     try:
-        # Could be expanded to save diagrams to a database
-        data = request.json
-        # For now, just return success
+        # Could be expanded to save diagrams to a database (read the body with
+        # request.json, which goes through the orjson provider). For now the
+        # body is not parsed at all, just return success
         return jsonify({"status": "success"})
     except Exception as e:
-        logging.error(f"Error saving diagram: {str(e)}")
-        logging.error(traceback.format_exc())
+        logging.exception("Error saving diagram: %s", e)
         return jsonify({
             "status": "error",
             "message": f"Gagal menyimpan diagram: {str(e)}"
@@ -103,119 +598,50 @@ def generate_misuse_cases():
         }), 503
 
     try:
-        data = request.json
-        use_case_name = data.get('useCaseName', '')
-        system_name = data.get('systemName', 'the system')
-        other_use_cases = data.get('otherUseCases', [])
-
-        # Validate input data
-        if not use_case_name:
-            return jsonify({
-                "status": "error",
-                "message": "Nama use case diperlukan"
-            }), 400
-
-        # Craft the prompt for the LLM - Modified to force Bahasa Indonesia output
-        system_prompt = """Anda adalah seorang ahli keamanan yang mengkhususkan diri dalam mengidentifikasi potensi kasus penyalahgunaan (misuse case) untuk sistem perangkat lunak.
-        Diberikan sebuah use case, identifikasi 3-5 skenario penyalahgunaan potensial yang dapat mengancamnya.
-        Format respons Anda sebagai array JSON dengan struktur berikut:
-        [
-            {
-                "name": "Nama singkat kasus penyalahgunaan",
-                "description": "Deskripsi detail yang menjelaskan skenario penyalahgunaan",
-                "actor": "Jenis aktor berbahaya yang mungkin melakukan ini",
-                "impact": "Dampak potensial dari kasus penyalahgunaan ini"
-            },
-            ...
-        ]
-        PENTING: Respons Anda HARUS sepenuhnya dalam Bahasa Indonesia, termasuk semua nilai dalam JSON.
-        Hanya berikan array JSON saja tanpa tambahan kalimat lain."""
+        # Read and validate input data
+        try:
+            use_case_name, system_name, other_use_cases = _read_misuse_case_input()
+        except InvalidInputError as e:
+            return jsonify({"status": "error", "message": e.message}), e.status_code
 
-        user_prompt = f"""Use Case: {use_case_name}
-        Sistem: {system_name}
-        Use Case Terkait: {', '.join(other_use_cases) if other_use_cases else 'Tidak ada'}
-        Harap generate 3-5 kasus penyalahgunaan (misuse case) realistis yang dapat mengancam use case ini.
-        Fokus pada kerentanan keamanan, pola penggunaan berbahaya, dan potensi eksploitasi sistem.
-        Respons Anda HARUS dalam Bahasa Indonesia."""
+        # Serve repeated (or semantically similar) requests from the cache
+        cache_key = MisuseCaseCache.make_key(use_case_name, system_name, other_use_cases)
+        cached = misuse_case_cache.lookup(cache_key)
+        if cached is not None:
+            api_logger.log_response(
+                start_time=time.monotonic_ns(),
+                status="success",
+                cache_hit=True
+            )
+            return jsonify({"status": "success", "data": cached})
 
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt}
-        ]
+        messages = build_messages(use_case_name, system_name, other_use_cases)
         
         # Log the API request
         start_time = api_logger.log_request(
-            model=MODEL,
+            model=', '.join(MODELS),
             messages=messages,
             temperature=0.7,
             user_case=use_case_name,
             system_name=system_name
         )
         
-        # Set timeout for API request
         try:
-            # Call the LLM using AIsuIte
-            response = client.chat.completions.create(
-                model=MODEL,
-                messages=messages,
-                temperature=0.7,
-                timeout=30  # 30 second timeout
-            )
-            
-            result = response.choices[0].message.content
-            
-            # Log successful response
+            # Call the configured LLM(s) using AIsuIte
+            result, misuse_cases = generate_with_models(messages, temperature=0.7)
+        except ValueError as parse_error:
+            # The LLM responded, but not with a usable JSON array of misuse cases
             api_logger.log_response(
                 start_time=start_time,
-                status="success",
-                content_length=len(result) if result else 0
+                status="error",
+                error=f"Kesalahan parsing JSON: {str(parse_error)}"
             )
-            
-            # Attempt to parse the JSON response
-            try:
-                # Try direct JSON parsing
-                misuse_cases = json.loads(result)
-                
-                # Validate the structure of each misuse case
-                for i, misuse_case in enumerate(misuse_cases):
-                    # Check for required fields
-                    for field in ["name", "description", "actor", "impact"]:
-                        if field not in misuse_case:
-                            misuse_case[field] = f"Informasi {field} tidak tersedia"
-                
-                return jsonify({"status": "success", "data": misuse_cases})
-            
-            except json.JSONDecodeError:
-                # If the response isn't valid JSON, try to extract JSON from the text
-                # This handles cases where the LLM might add explanatory text
-                import re
-                json_match = re.search(r'\[\s*\{.*\}\s*\]', result, re.DOTALL)
-                if json_match:
-                    try:
-                        misuse_cases = json.loads(json_match.group(0))
-                        return jsonify({"status": "success", "data": misuse_cases})
-                    except Exception as parse_error:
-                        api_logger.log_response(
-                            start_time=start_time,
-                            status="error",
-                            error=f"Kesalahan parsing JSON: {str(parse_error)}"
-                        )
-                        logging.error(f"JSON parse error: {str(parse_error)}")
-                        logging.error(traceback.format_exc())
-                
-                # If all parsing attempts fail, return a helpful error message
-                error_msg = "Gagal memproses respons LLM sebagai JSON"
-                api_logger.log_response(
-                    start_time=start_time,
-                    status="error",
-                    error=error_msg
-                )
-                return jsonify({
-                    "status": "error",
-                    "message": error_msg,
-                    "data": []  # Return empty array instead of failing completely
-                })
-                
+            logging.exception("JSON parse error: %s", parse_error)
+            return jsonify({
+                "status": "error",
+                "message": "Gagal memproses respons LLM sebagai JSON",
+                "data": []  # Return empty array instead of failing completely
+            })
         except Exception as e:
             # Log the error
             api_logger.log_response(
@@ -223,23 +649,141 @@ def generate_misuse_cases():
                 status="error",
                 error=str(e)
             )
-            logging.error(f"LLM API error: {str(e)}")
-            logging.error(traceback.format_exc())
+            logging.exception("LLM API error: %s", e)
             return jsonify({
                 "status": "error", 
                 "message": f"Error saat generate kasus penyalahgunaan: {str(e)}",
                 "data": []  # Return empty array instead of failing completely
             })
+
+        # Log successful response
+        api_logger.log_response(
+            start_time=start_time,
+            status="success",
+            content_length=len(result) if result else 0
+        )
+        if _should_cache(misuse_cases):
+            misuse_case_cache.store(cache_key, misuse_cases)
+        return jsonify({"status": "success", "data": misuse_cases})
             
     except Exception as e:
         # Catch all other errors
-        logging.error(f"Unexpected error in generate_misuse_cases: {str(e)}")
-        logging.error(traceback.format_exc())
+        logging.exception("Unexpected error in generate_misuse_cases: %s", e)
         return jsonify({
             "status": "error",
             "message": f"Kesalahan tidak terduga: {str(e)}",
             "data": []  # Return empty array instead of failing completely
         }), 500
 
+@app.route('/generate_misuse_cases/stream', methods=['POST'])
+def stream_misuse_cases():
+    """Stream generated misuse cases as Server-Sent Events.
+
+    Emits one ``misuse_case`` event per misuse case as soon as the LLM has
+    produced it, followed by a final ``done`` (or ``error``) event.
+    """
+    # Check if AI is available
+    if not AISUITE_AVAILABLE or client is None:
+        return jsonify({
+            "status": "error",
+            "message": "AI service tidak tersedia. Fitur ini memerlukan konfigurasi AI."
+        }), 503
+
+    try:
+        use_case_name, system_name, other_use_cases = _read_misuse_case_input()
+    except InvalidInputError as e:
+        return jsonify({"status": "error", "message": e.message}), e.status_code
+
+    cache_key = MisuseCaseCache.make_key(use_case_name, system_name, other_use_cases)
+    messages = build_messages(use_case_name, system_name, other_use_cases)
+
+    def generate():
+        cached = misuse_case_cache.lookup(cache_key)
+        if cached is not None:
+            api_logger.log_response(
+                start_time=time.monotonic_ns(),
+                status="success",
+                cache_hit=True
+            )
+            for misuse_case in cached:
+                yield _sse_event('misuse_case', misuse_case)
+            yield _sse_event('done', {"status": "success", "count": len(cached)})
+            return
+
+        start_time = api_logger.log_request(
+            model=MODEL,
+            messages=messages,
+            temperature=0.7,
+            user_case=use_case_name,
+            system_name=system_name,
+            stream=True
+        )
+        parser = MisuseCaseStreamParser()
+        misuse_cases = []
+        contents = []
+        try:
+            for content in stream_completion(MODEL, messages, temperature=0.7):
+                contents.append(content)
+                for raw_case in parser.feed(content):
+                    try:
+                        misuse_case = parse_misuse_cases(f"[{raw_case}]")[0]
+                    except ValueError as parse_error:
+                        logging.warning(f"Skipping unparseable streamed misuse case: {str(parse_error)}")
+                        continue
+                    # e.g. a {"misuse_cases": [...]} wrapper rather than a misuse case
+                    if not has_misuse_case_content(misuse_case):
+                        logging.warning("Skipping streamed object without misuse case fields")
+                        continue
+                    misuse_cases.append(misuse_case)
+                    yield _sse_event('misuse_case', misuse_case)
+        except Exception as e:
+            api_logger.log_response(
+                start_time=start_time,
+                status="error",
+                error=str(e)
+            )
+            logging.exception("LLM API streaming error: %s", e)
+            yield _sse_event('error', {
+                "status": "error",
+                "message": f"Error saat generate kasus penyalahgunaan: {str(e)}"
+            })
+            return
+
+        result = ''.join(contents)
+        api_logger.log_response(
+            start_time=start_time,
+            status="success",
+            content_length=len(result)
+        )
+        if not misuse_cases:
+            # No misuse case objects at the top level (e.g. the array was wrapped
+            # in another object); parse the full response like the JSON endpoint
+            try:
+                misuse_cases = [
+                    misuse_case for misuse_case in extract_misuse_cases(result)
+                    if has_misuse_case_content(misuse_case)
+                ]
+            except ValueError as parse_error:
+                logging.warning(f"Streamed response is not a misuse case array: {str(parse_error)}")
+            for misuse_case in misuse_cases:
+                yield _sse_event('misuse_case', misuse_case)
+        if not misuse_cases:
+            yield _sse_event('error', {
+                "status": "error",
+                "message": "Gagal memproses respons LLM sebagai JSON"
+            })
+            return
+
+        # Placeholder-only objects were filtered out above, so this is cacheable
+        misuse_case_cache.store(cache_key, misuse_cases)
+        yield _sse_event('done', {"status": "success", "count": len(misuse_cases)})
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    # Development server only; deployments run under gunicorn (see Dockerfile)
+    app.run(debug=os.getenv('FLASK_DEBUG', '0') == '1')
\ No newline at end of file
@@ -0,0 +1,10 @@
+# gunicorn.conf.py - loaded automatically when gunicorn is started from this directory
+import os
+
+bind = "0.0.0.0:5000"
+workers = int(os.getenv('WEB_WORKERS', '4'))
+# Threaded workers, so requests waiting on the LLM don't block each other
+worker_class = "gthread"
+# WORKER_THREADS also sizes the LLM fan-out thread pool in app.py
+threads = int(os.getenv('WORKER_THREADS', '8'))
+timeout = 60
@@ -289,6 +289,18 @@ function generateMisuseCases() {
         misuseState.selectedMisuseCases.clear();
         updateButtonStates();
         
+        // Clear the previous results so stale items can't be selected while the
+        // new ones are generated (their indexes would point at the new list)
+        misuseState.generatedMisuseCases = [];
+        const listElement = document.getElementById('misuse-case-list');
+        if (listElement) {
+            listElement.innerHTML = `
+                <p class="empty-state">Generating misuse cases...</p>
+            `;
+        }
+        const clearButton = document.getElementById('clear-misuse-cases');
+        if (clearButton) clearButton.disabled = true;
+        
         // Call the server to generate misuse cases
         fetch('/generate_misuse_cases', {
             method: 'POST',
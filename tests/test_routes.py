@@ -0,0 +1,119 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import app
+
+MISUSE_CASES_JSON = json.dumps([
+    {"name": "Brute force", "description": "Menebak kata sandi", "actor": "Penyerang", "impact": "Akun diambil alih"},
+    {"name": "Phishing", "description": "Halaman login palsu", "actor": "Penipu", "impact": "Kredensial bocor"},
+])
+
+
+class StubCompletions:
+    """Mimics client.chat.completions for a fixed LLM response"""
+
+    def __init__(self, content, streaming=True):
+        self.content = content
+        self.streaming = streaming
+        self.calls = []
+
+    def create(self, model, messages, temperature, stream=False, **kwargs):
+        self.calls.append({"model": model, "stream": stream})
+        if not stream:
+            message = SimpleNamespace(content=self.content)
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+        if not self.streaming:
+            raise app.LLMError("GroqProvider does not support streaming chat completions.")
+        return iter([
+            SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=self.content[i:i + 7]))])
+            for i in range(0, len(self.content), 7)
+        ])
+
+
+@pytest.fixture
+def stub_llm(monkeypatch):
+    """Install a stub LLM client and a fresh cache, returning a setter for the response"""
+    def install(content, streaming=True):
+        completions = StubCompletions(content, streaming)
+        monkeypatch.setattr(app, "client", SimpleNamespace(chat=SimpleNamespace(completions=completions)))
+        return completions
+
+    monkeypatch.setattr(app, "AISUITE_AVAILABLE", True)
+    monkeypatch.setattr(app, "MODEL", "groq:test-model")
+    monkeypatch.setattr(app, "MODELS", ["groq:test-model"])
+    monkeypatch.setattr(app, "LLM_TIMEOUT", SimpleNamespace(read=30.0))
+    monkeypatch.setattr(app, "misuse_case_cache", app.MisuseCaseCache())
+    return install
+
+
+def read_events(response):
+    """Parse a Server-Sent Events response into (event, data) tuples"""
+    events = []
+    for frame in response.get_data(as_text=True).split("\n\n"):
+        if not frame:
+            continue
+        lines = dict(line.split(": ", 1) for line in frame.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def post_stream(body):
+    return app.app.test_client().post("/generate_misuse_cases/stream", json=body)
+
+
+def test_stream_sends_each_misuse_case_then_done(stub_llm):
+    completions = stub_llm(MISUSE_CASES_JSON)
+    events = read_events(post_stream({"useCaseName": "Login"}))
+
+    assert [event for event, _ in events] == ["misuse_case", "misuse_case", "done"]
+    assert events[0][1]["name"] == "Brute force"
+    assert events[-1][1] == {"status": "success", "count": 2}
+    assert [call["stream"] for call in completions.calls] == [True]
+
+
+def test_stream_falls_back_to_single_call_when_provider_cannot_stream(stub_llm):
+    completions = stub_llm(MISUSE_CASES_JSON, streaming=False)
+    events = read_events(post_stream({"useCaseName": "Login"}))
+
+    assert [event for event, _ in events] == ["misuse_case", "misuse_case", "done"]
+    assert [call["stream"] for call in completions.calls] == [True, False]
+
+
+def test_stream_unwraps_misuse_cases_nested_in_an_object(stub_llm):
+    stub_llm(json.dumps({"misuse_cases": json.loads(MISUSE_CASES_JSON)}))
+    events = read_events(post_stream({"useCaseName": "Login"}))
+
+    assert [data["name"] for event, data in events if event == "misuse_case"] == ["Brute force", "Phishing"]
+    assert events[-1] == ("done", {"status": "success", "count": 2})
+    cached = app.misuse_case_cache.lookup(app.MisuseCaseCache.make_key("Login", "the system", []))
+    assert [misuse_case["name"] for misuse_case in cached] == ["Brute force", "Phishing"]
+
+
+def test_stream_does_not_cache_placeholder_only_results(stub_llm):
+    stub_llm('[{"title": "Bukan misuse case"}]')
+    events = read_events(post_stream({"useCaseName": "Login"}))
+
+    assert events == [("error", {"status": "error", "message": "Gagal memproses respons LLM sebagai JSON"})]
+    assert app.misuse_case_cache.lookup(app.MisuseCaseCache.make_key("Login", "the system", [])) is None
+
+
+def test_stream_rejects_non_object_body(stub_llm):
+    stub_llm(MISUSE_CASES_JSON)
+    response = post_stream([1, 2])
+
+    assert response.status_code == 400
+    assert response.get_json()["status"] == "error"
+
+
+def test_empty_result_is_not_cached(stub_llm):
+    client = app.app.test_client()
+    stub_llm("[]")
+    first = client.post("/generate_misuse_cases", json={"useCaseName": "Login"}).get_json()
+    assert first == {"status": "success", "data": []}
+
+    completions = stub_llm(MISUSE_CASES_JSON)
+    second = client.post("/generate_misuse_cases", json={"useCaseName": "Login"}).get_json()
+    assert [misuse_case["name"] for misuse_case in second["data"]] == ["Brute force", "Phishing"]
+    assert len(completions.calls) == 1
@@ -0,0 +1,65 @@
+import json
+
+from app import MisuseCaseStreamParser
+
+
+def feed_in_chunks(text, chunk_size):
+    """Feed text to a new parser in fixed-size chunks and collect all objects"""
+    parser = MisuseCaseStreamParser()
+    completed = []
+    for i in range(0, len(text), chunk_size):
+        completed.extend(parser.feed(text[i:i + chunk_size]))
+    return completed
+
+
+def test_extracts_each_object_of_an_array():
+    text = '[{"name": "A", "actor": "X"}, {"name": "B", "actor": "Y"}]'
+    completed = MisuseCaseStreamParser().feed(text)
+    assert [json.loads(obj) for obj in completed] == [
+        {"name": "A", "actor": "X"},
+        {"name": "B", "actor": "Y"},
+    ]
+
+
+def test_objects_are_emitted_as_soon_as_they_complete():
+    parser = MisuseCaseStreamParser()
+    assert parser.feed('[{"name": "A"}, {"name": ') == ['{"name": "A"}']
+    assert parser.feed('"B"}]') == ['{"name": "B"}']
+
+
+def test_escaped_quotes_inside_strings():
+    text = r'[{"name": "Kutipan \"palsu\" dan \\", "impact": "}"}]'
+    completed = feed_in_chunks(text, 1)
+    assert [json.loads(obj) for obj in completed] == [
+        {"name": 'Kutipan "palsu" dan \\', "impact": "}"}
+    ]
+
+
+def test_braces_inside_strings():
+    text = '[{"description": "payload {\\"a\\": [1]} }{ end", "actor": "X"}]'
+    completed = feed_in_chunks(text, 3)
+    assert [json.loads(obj) for obj in completed] == [
+        {"description": 'payload {"a": [1]} }{ end', "actor": "X"}
+    ]
+
+
+def test_nested_objects_stay_in_their_parent():
+    text = '[{"name": "A", "meta": {"level": {"value": 1}}}]'
+    completed = feed_in_chunks(text, 2)
+    assert [json.loads(obj) for obj in completed] == [
+        {"name": "A", "meta": {"level": {"value": 1}}}
+    ]
+
+
+def test_prose_around_the_array_is_ignored():
+    text = (
+        'Berikut adalah kasus penyalahgunaan:\n'
+        '```json\n[{"name": "A"}, {"name": "B"}]\n```\n'
+        'Semoga membantu.'
+    )
+    completed = feed_in_chunks(text, 5)
+    assert [json.loads(obj) for obj in completed] == [{"name": "A"}, {"name": "B"}]
+
+
+def test_incomplete_trailing_object_is_not_emitted():
+    assert feed_in_chunks('[{"name": "A"}, {"name": "B"', 4) == ['{"name": "A"}']